@@ -1,78 +1,289 @@
 # app/routes.py - Optimized version
-from flask import Blueprint, render_template, request, jsonify, current_app
+from flask import Blueprint, Response, render_template, request, current_app
+import orjson
 import base64
+import logging
 import numpy as np
 import cv2
-import sys
 import os
 import threading
 import time
-from queue import Queue
-import gc
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Empty, Queue
 
-# Add the project root to sys.path to import back_end_process
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from back_end_process.detector import detect_objects
+from back_end_process.detector import detect_objects, detect_objects_batch
+from .routes_kernels import dhash_bits
 from back_end_process.voice_api import speak_detection
 
 main = Blueprint('main', __name__)
 
+_LOG = logging.getLogger(__name__)
+
+def _ojson(obj):
+    """Serialize a response with orjson (2-5x faster than stdlib json)"""
+    return Response(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+                    mimetype='application/json')
+
 # Global variables for performance optimization
 detection_queue = Queue(maxsize=3)  # Limit queue size
-last_detection_time = 0
-detection_cooldown = 1.5  # Minimum seconds between detections
-last_detections = []
-processing_lock = threading.Lock()
+
+# Cooldown state lives in one-element lists: item assignment is a single
+# atomic bytecode under the GIL, so the hot cooldown check needs no lock
+_LAST_NS = [0]                     # monotonic_ns of last successful detection
+_COOLDOWN_NS = 1_500_000_000       # minimum ns between detections
+_LAST_DETS = [[]]                  # most recent detection list
+_LAST_BODY = [b'[]']               # _LAST_DETS pre-encoded as JSON bytes
+
+# The state lock only guards the handful of shared assignments in
+# _run_detection -- a microsecond critical section instead of
+# serializing whole detections. Inference itself is already serialized
+# by the single batch worker below, so it needs no lock of its own.
+_state_lock = threading.Lock()
+
+# Micro-batching: concurrent requests that land within a short window
+# are stacked into one YOLO call, which amortizes per-call launch and
+# pre/postprocess overhead across the batch
+BATCH_SIZE = 8
+BATCH_WINDOW = 0.010  # seconds to wait for more frames
+REQ_Q = Queue()
+
+
+def _detect_via_batcher(frame):
+    """Hand a frame to the batch worker and wait for its detections"""
+    fut = Future()
+    REQ_Q.put((frame, fut))
+    return fut.result(timeout=DETECTION_TIMEOUT)
+
+
+def _batch_worker():
+    """Collect frames arriving within BATCH_WINDOW and run them as one call"""
+    while True:
+        items = [REQ_Q.get()]
+        while len(items) < BATCH_SIZE:
+            try:
+                items.append(REQ_Q.get(timeout=BATCH_WINDOW))
+            except Empty:
+                break
+
+        frames = [f for f, _ in items]
+        try:
+            if len(frames) == 1:
+                results = [detect_objects(frames[0])]
+            else:
+                results = detect_objects_batch(frames)
+            for (_, fut), dets in zip(items, results):
+                fut.set_result(dets)
+        except Exception as exc:
+            for _, fut in items:
+                fut.set_exception(exc)
+
+
+threading.Thread(target=_batch_worker, daemon=True).start()
+
+# Bounded executor for the CPU-heavy detection work. Submitting through
+# a fixed pool keeps the number of in-flight inferences explicit instead
+# of letting bursts of requests pile up on WSGI worker threads.
+EXECUTOR = ThreadPoolExecutor(max_workers=max(2, (os.cpu_count() or 2) // 2))
+MAX_PENDING = EXECUTOR._max_workers * 2
+_pending_slots = threading.BoundedSemaphore(MAX_PENDING)
+DETECTION_TIMEOUT = 5.0
+
+# Target-size cache: frame sizes are effectively constant per client,
+# so the float scale math runs once per distinct input shape
+_RESIZE_CACHE = {}
+
+
+def _target_size(width, height):
+    """Return the cached (width, height) to downscale this shape to"""
+    key = (width, height)
+    tgt = _RESIZE_CACHE.get(key)
+    if tgt is None:
+        scale = 640 / width
+        tgt = (int(width * scale), int(height * scale))
+        _RESIZE_CACHE[key] = tgt
+    return tgt
+
+
+# Compressed-size thresholds for picking a reduced JPEG decode.  A 640px
+# JPEG at the quality the frontend sends is well under 200 KB, so larger
+# payloads are high-res frames we would immediately downscale anyway --
+# libjpeg can decode those directly at 1/2 or 1/4 scale, skipping most of
+# the IDCT work and the full-size pixel buffer.
+REDUCED_2_BYTES = 200 * 1024   # likely wider than 1280px
+REDUCED_4_BYTES = 800 * 1024   # likely wider than 2560px
+
+
+def _imdecode_flag(compressed_size):
+    """Pick an imdecode flag that downscales during decode when possible"""
+    if compressed_size > REDUCED_4_BYTES:
+        return cv2.IMREAD_REDUCED_COLOR_4
+    if compressed_size > REDUCED_2_BYTES:
+        return cv2.IMREAD_REDUCED_COLOR_2
+    return cv2.IMREAD_COLOR
+
+
+def _decode_frame(nparr):
+    """Decode a JPEG, downscaling during decode when worthwhile
+
+    Compressed size is only a heuristic for pixel size: a <=640px frame
+    encoded at high quality can land in a reduced tier, and inference on
+    a half-scale frame silently costs accuracy. If a reduced decode
+    comes out narrower than the model input, pay one full-resolution
+    re-decode to recover.
+    """
+    flag = _imdecode_flag(nparr.size)
+    frame = cv2.imdecode(nparr, flag)
+    if frame is not None and flag != cv2.IMREAD_COLOR and frame.shape[1] < 640:
+        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    return frame
+
+# Perceptual-hash cache: when the incoming frame looks the same as the
+# previous one, the YOLO forward pass (the dominant cost) is skipped and
+# the cached detections are returned instead
+SCENE_HASH_DISTANCE = 5        # max Hamming distance treated as "same scene"
+SCENE_CACHE_MAX_AGE = 10.0     # seconds before a cached result goes stale
+_scene_hash = None
+_scene_hash_time = 0
+
+
+def _dhash(frame):
+    """Compute a 64-bit difference hash of the frame as an int"""
+    small = cv2.resize(frame, (9, 8), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return int(dhash_bits(gray)) & 0xFFFFFFFFFFFFFFFF
+
+
+def _is_same_scene(frame_hash, now):
+    """Check whether the frame matches the cached scene hash"""
+    if _scene_hash is None or now - _scene_hash_time > SCENE_CACHE_MAX_AGE:
+        return False
+    return bin(frame_hash ^ _scene_hash).count('1') <= SCENE_HASH_DISTANCE
+
+# The landing page is static per process, so it's rendered once at
+# startup and served as cached bytes with an ETag for conditional GETs
+_HOME_BODY = None
+_HOME_ETAG = None
+
+
+def cache_home_page(body, etag):
+    """Store the pre-rendered home page (called from create_app)"""
+    global _HOME_BODY, _HOME_ETAG
+    _HOME_BODY = body
+    _HOME_ETAG = etag
+
 
 @main.route('/')
 def index():
-    return render_template('index.html')
+    if _HOME_BODY is None:
+        return render_template('index.html')
+    if request.if_none_match and _HOME_ETAG in request.if_none_match:
+        return '', 304
+    return Response(_HOME_BODY, mimetype='text/html',
+                    headers={'ETag': _HOME_ETAG,
+                             'Cache-Control': 'public, max-age=60'})
 
 @main.route('/detect', methods=['POST'])
 def detect():
-    global last_detection_time, last_detections
-    
-    # Check cooldown to prevent overload
-    current_time = time.time()
-    if current_time - last_detection_time < detection_cooldown:
-        return jsonify(last_detections)
+    # Check cooldown to prevent overload (monotonic: immune to NTP jumps)
+    now_ns = time.monotonic_ns()
+    if now_ns - _LAST_NS[0] < _COOLDOWN_NS:
+        # Return the pre-encoded bytes: no JSON work on the common path
+        return Response(_LAST_BODY[0], mimetype='application/json')
+    current_time = now_ns / 1e9
     
     data = request.get_json()
     if not data or 'image' not in data:
-        return jsonify({'error': 'No image provided'}), 400
+        return _ojson({'error': 'No image provided'}), 400
 
     try:
-        # Decode base64 image with error handling
-        header, encoded = data['image'].split(",", 1)
-        image_bytes = base64.b64decode(encoded)
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
+        # Decode base64 image with error handling.
+        # partition() avoids allocating a second copy of the (multi-MB)
+        # payload string, and feeding the decoded bytes straight into
+        # np.frombuffer avoids keeping an extra reference alive.
+        encoded = data['image'].partition(",")[2]
+        nparr = np.frombuffer(base64.b64decode(encoded), dtype=np.uint8)
+        frame = _decode_frame(nparr)
+
         if frame is None:
-            return jsonify({'error': 'Failed to decode image'}), 400
-            
-        # Resize frame for faster processing
+            return _ojson({'error': 'Failed to decode image'}), 400
+
+        # Resize frame for faster processing (fallback for sizes the
+        # reduced decode didn't already bring down to <= 640)
         height, width = frame.shape[:2]
         if width > 640:
-            scale = 640 / width
-            new_width = int(width * scale)
-            new_height = int(height * scale)
-            frame = cv2.resize(frame, (new_width, new_height))
-            print(f"🔄 Resized frame from {width}x{height} to {new_width}x{new_height}")
+            new_width, new_height = _target_size(width, height)
+            # INTER_AREA uses OpenCV's box-filter SIMD path, which is
+            # faster and higher quality than bilinear for downscales.
+            # No pooled dst buffer here: the frame escapes this handler
+            # into the batch queue, so it must own its memory
+            frame = cv2.resize(frame, (new_width, new_height),
+                               interpolation=cv2.INTER_AREA)
+            if _LOG.isEnabledFor(logging.DEBUG):
+                _LOG.debug("Resized frame from %dx%d to %dx%d",
+                           width, height, new_width, new_height)
             
     except Exception as e:
         print(f"❌ Image decoding failed: {str(e)}")
-        return jsonify({'error': f'Image decoding failed: {str(e)}'}), 400
+        return _ojson({'error': f'Image decoding failed: {str(e)}'}), 400
+
+    return _handle_frame(frame, current_time)
+
+@main.route('/detect_raw', methods=['POST'])
+def detect_raw():
+    """Detect objects in a raw JPEG body (no base64: 25% less bandwidth
+    and one less decode pass than the legacy /detect path)"""
+    now_ns = time.monotonic_ns()
+    if now_ns - _LAST_NS[0] < _COOLDOWN_NS:
+        return Response(_LAST_BODY[0], mimetype='application/json')
+    current_time = now_ns / 1e9
+
+    body = request.get_data(cache=False, as_text=False)
+    if not body:
+        return _ojson({'error': 'No image provided'}), 400
 
-    # Process detection in background thread to avoid blocking
     try:
-        with processing_lock:
-            detections = detect_objects(frame)
-            last_detections = detections
-            last_detection_time = current_time
-            
-        print(f"🔍 Detected {len(detections)} objects: {[d['object'] for d in detections]}")
+        nparr = np.frombuffer(body, dtype=np.uint8)
+        frame = _decode_frame(nparr)
+
+        if frame is None:
+            return _ojson({'error': 'Failed to decode image'}), 400
+
+        height, width = frame.shape[:2]
+        if width > 640:
+            new_width, new_height = _target_size(width, height)
+            frame = cv2.resize(frame, (new_width, new_height),
+                               interpolation=cv2.INTER_AREA)
+
+    except Exception as e:
+        print(f"❌ Image decoding failed: {str(e)}")
+        return _ojson({'error': f'Image decoding failed: {str(e)}'}), 400
+
+    return _handle_frame(frame, current_time)
+
+def _handle_frame(frame, current_time):
+    """Shared post-decode pipeline for /detect and /detect_raw
+
+    `frame` stays BGR end-to-end: detect_objects documents that the one
+    required BGR->RGB reorder happens inside Ultralytics, so no extra
+    cvtColor (and no extra WxHx3 copy) is done here.
+    """
+    # Static scene: reuse the cached detections and skip inference
+    frame_hash = _dhash(frame)
+    if _is_same_scene(frame_hash, current_time):
+        return Response(_LAST_BODY[0], mimetype='application/json')
+
+    # Run detection on the bounded executor; reject outright when the
+    # pool is saturated rather than queueing unboundedly
+    if not _pending_slots.acquire(blocking=False):
+        return _ojson({'error': 'Detection queue full, try again later'}), 429
+
+    try:
+        future = EXECUTOR.submit(_run_detection, frame, frame_hash, current_time)
+        detections = future.result(timeout=DETECTION_TIMEOUT)
+
+        # %-style args keep formatting (and the list build) lazy
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Detected %d objects", len(detections))
         
         # Send to voice processing asynchronously
         if detections:
@@ -83,15 +294,32 @@ def detect():
             )
             voice_thread.start()
         
-        # Clean up memory
+        # Drop the (large) frame reference; generational GC handles the
+        # rest -- a full gc.collect() here stalls the request thread
         del frame
-        gc.collect()
-        
-        return jsonify(detections)
+
+        return _ojson(detections)
         
     except Exception as e:
         print(f"❌ Detection error: {str(e)}")
-        return jsonify({'error': f'Detection failed: {str(e)}'}), 500
+        return _ojson({'error': f'Detection failed: {str(e)}'}), 500
+    finally:
+        _pending_slots.release()
+
+def _run_detection(frame, frame_hash, current_time):
+    """Run detection on an executor thread and update the shared state"""
+    global _scene_hash, _scene_hash_time
+
+    detections = _detect_via_batcher(frame)
+
+    with _state_lock:
+        _LAST_DETS[0] = detections
+        _LAST_BODY[0] = orjson.dumps(detections, option=orjson.OPT_SERIALIZE_NUMPY)
+        _LAST_NS[0] = int(current_time * 1e9)
+        _scene_hash = frame_hash
+        _scene_hash_time = current_time
+
+    return detections
 
 def process_voice_announcements(detections):
     """Process voice announcements with the new system"""
@@ -125,15 +353,12 @@ def process_voice_announcements(detections):
     except Exception as e:
         print(f"❌ Voice processing error: {str(e)}")
 
-# Remove the old import
-from back_end_process.voice_api import speak_detection
-
 @main.route('/status', methods=['GET'])
 def get_status():
     """Get system status information"""
-    return jsonify({
+    return _ojson({
         'detection_active': True,
-        'last_detection_count': len(last_detections),
+        'last_detection_count': len(_LAST_DETS[0]),
         'system_load': 'normal',
         'voice_system': 'active'
     })
@@ -146,7 +371,7 @@ def test_voice():
         
         success = speak_detection("system", "Voice system working correctly")
         
-        return jsonify({
+        return _ojson({
             'success': success,
             'method': current_voice_method.name if current_voice_method else 'None',
             'message': 'Voice test queued' if success else 'Voice test failed or on cooldown'
@@ -154,7 +379,7 @@ def test_voice():
             
     except Exception as e:
         print(f"❌ Voice test error: {str(e)}")
-        return jsonify({
+        return _ojson({
             'error': str(e)
         }), 500
 
@@ -162,16 +387,16 @@ def test_voice():
 def voice_debug():
     """Debug endpoint to check voice system status"""
     try:
-        from back_end_process.voice_api import voice_initialized, voice_queue, voice_thread, last_announcement_time
+        from back_end_process.voice_api import voice_active, voice_queue, voice_thread, last_announcement_time
         import time
-        
-        return jsonify({
-            'voice_initialized': voice_initialized,
-            'queue_size': voice_queue.qsize(),
+
+        return _ojson({
+            'voice_active': voice_active,
+            'queue_size': len(voice_queue),
             'thread_alive': voice_thread.is_alive() if voice_thread else False,
-            'last_announcement': time.time() - last_announcement_time,
-            'queue_maxsize': voice_queue.maxsize,
+            'last_announcement': time.monotonic() - last_announcement_time,
+            'queue_maxsize': voice_queue.maxlen,
             'timestamp': time.time()
         })
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return _ojson({'error': str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,32 @@
+# app/routes_kernels.py - JIT-compiled numeric kernels for the routes hot path
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Fall back to the plain Python functions when numba is absent
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True)
+def dhash_bits(gray):
+    """Pack row-wise brightness gradients of a small gray image into an int"""
+    h = 0
+    for r in range(gray.shape[0]):
+        for c in range(gray.shape[1] - 1):
+            h = (h << 1) | (1 if gray[r, c + 1] > gray[r, c] else 0)
+    return h
+
+
+def warmup_kernels():
+    """Trigger JIT compilation so the first request doesn't pay for it"""
+    dhash_bits(np.zeros((8, 9), np.uint8))
@@ -0,0 +1,120 @@
+# config.py - System Configuration
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass(frozen=True, slots=True)
+class OptimizedConfig:
+    """Configuration for the optimized AI Vision System.
+
+    Frozen with slots: every attribute read is a fixed-offset slot
+    lookup instead of a class-dict probe, and nothing can mutate
+    settings at runtime.
+    """
+
+    # Flask Configuration
+    SECRET_KEY: str = os.environ.get('SECRET_KEY') or 'ai-vision-system-key-2025'
+    DEBUG: bool = True
+    THREADED: bool = True
+
+    # Detection Configuration
+    DETECTION_CONFIDENCE: float = 0.6   # YOLO confidence threshold
+    DETECTION_IOU: float = 0.45         # IoU threshold for Non-Maximum Suppression
+    MAX_DETECTIONS: int = 20            # Maximum detections per frame
+    DETECTION_COOLDOWN: float = 1.5     # Minimum seconds between detections
+    DETECTION_STRIDE: int = 3           # Run YOLO every Nth frame; tracker coasts between
+
+    # Image Processing Configuration
+    MAX_IMAGE_WIDTH: int = 640          # Maximum image width for processing
+    IMAGE_QUALITY: float = 0.6          # JPEG quality for transmission
+    ENABLE_IMAGE_RESIZE: bool = True    # Enable automatic image resizing
+
+    # Voice Configuration
+    VOICE_RATE: int = 160               # Speech rate (words per minute)
+    VOICE_VOLUME: float = 0.8           # Voice volume (0.0 to 1.0)
+    VOICE_QUEUE_SIZE: int = 10          # Maximum voice announcements in queue
+    VOICE_TIMEOUT: float = 0.5          # Timeout for adding to voice queue
+
+    # Performance Configuration
+    # OpenCV spawns cpu_count() workers per operation by default; with
+    # THREADED Flask that oversubscribes the cores badly, so keep the
+    # internal pool small
+    CV2_NUM_THREADS: int = 2
+    WARMUP_ENABLED: bool = True         # Run dummy inferences at startup
+    HEADLESS: bool = os.environ.get('OPJECT_HEADLESS', '0') == '1'  # Skip all display work
+    TIER_LATENCY_MS_BUDGET: float = 66.0  # Per-frame budget before dropping a model tier (~15 FPS)
+    ENABLE_GARBAGE_COLLECTION: bool = True  # Enable automatic garbage collection
+    MEMORY_CLEANUP_INTERVAL: int = 30   # Seconds between memory cleanup
+    LOG_PERFORMANCE: bool = True        # Enable performance logging
+
+    # Object Detection Labels (reduced for performance)
+    IMPORTANT_LABELS: frozenset = frozenset({
+        "person", "car", "bus", "bicycle", "motorcycle",
+        "dog", "cat", "bird", "horse",
+        "chair", "couch", "bed", "dining table", "toilet",
+        "bottle", "cup", "wine glass", "bowl",
+        "book", "laptop", "cell phone", "tv", "remote",
+        "door", "stairs", "traffic light", "stop sign"
+    })
+
+    # Grid Positions
+    GRID_POSITIONS: tuple = (
+        ("top left", "top center", "top right"),
+        ("middle left", "center", "middle right"),
+        ("bottom left", "bottom center", "bottom right")
+    )
+
+    @lru_cache(maxsize=None)
+    def get_model_path(self):
+        """Get the path to the YOLO model"""
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        return os.path.join(current_dir, "models", "best.pt")
+
+    @lru_cache(maxsize=None)
+    def get_fallback_model(self):
+        """Get fallback model if custom model not found"""
+        return "yolov8n.pt"
+
+    # (attribute, low, high, message) triples checked by validate_config;
+    # not annotated, so the dataclass machinery leaves it a class constant
+    _RULES = (
+        ('DETECTION_CONFIDENCE', 0.1, 1.0, "Detection confidence should be between 0.1 and 1.0"),
+        ('MAX_IMAGE_WIDTH', 320, 1920, "Max image width should be between 320 and 1920"),
+        ('VOICE_RATE', 50, 300, "Voice rate should be between 50 and 300"),
+    )
+
+    @lru_cache(maxsize=None)
+    def validate_config(self):
+        """Validate configuration settings"""
+        return [message for name, low, high, message in self._RULES
+                if not low <= getattr(self, name) <= high]
+
+
+# Development Configuration (inherits from OptimizedConfig)
+@dataclass(frozen=True, slots=True)
+class DevelopmentConfig(OptimizedConfig):
+    DEBUG: bool = True
+    LOG_PERFORMANCE: bool = True
+    DETECTION_CONFIDENCE: float = 0.5  # Lower confidence for testing
+
+
+# Production Configuration (inherits from OptimizedConfig)
+@dataclass(frozen=True, slots=True)
+class ProductionConfig(OptimizedConfig):
+    DEBUG: bool = False
+    LOG_PERFORMANCE: bool = False
+    DETECTION_CONFIDENCE: float = 0.7  # Higher confidence for production
+
+
+# Configuration factory
+@lru_cache(maxsize=4)
+def get_config(env='development'):
+    """Get the (single) configuration instance for an environment"""
+    configs = {
+        'development': DevelopmentConfig,
+        'production': ProductionConfig,
+        'default': OptimizedConfig
+    }
+
+    return configs.get(env, OptimizedConfig)()
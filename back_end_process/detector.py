@@ -1,48 +1,312 @@
 # back_end_process/detector.py - Optimized version
 from ultralytics import YOLO
 import cv2
+import numpy as np
+import logging
 import os
-import sys
+import threading
 import time
-import gc
+
+logger = logging.getLogger(__name__)
 
 # Get the absolute path to the models directory
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
-model_path = os.path.join(project_root, "models", "best.pt")
-
-print(f"🔍 Loading model from: {model_path}")
-
-# Check if model file exists
-if not os.path.exists(model_path):
-    print(f"❌ Model file not found at: {model_path}")
-    models_dir = os.path.join(project_root, "models")
-    if os.path.exists(models_dir):
-        print("Available files in models directory:")
-        for file in os.listdir(models_dir):
-            print(f"   - {file}")
-    else:
-        print("   Models directory doesn't exist!")
-        
-    # Fallback to a pre-trained YOLOv8 model
-    print("🔄 Falling back to pre-trained YOLOv8n model")
-    model_path = "yolov8n.pt"
 
-try:
-    # Load model with optimized settings
-    model = YOLO(model_path)
-    model.overrides['verbose'] = False  # Reduce logging
-    print("✅ YOLO model loaded successfully")
-except Exception as e:
-    print(f"❌ Failed to load YOLO model: {str(e)}")
-    sys.exit(1)
-
-# Optimized important labels - reduced set for better performance
-IMPORTANT_LABELS = {
+# Opt-in INT8 quantization for the TensorRT export. Needs a dataset
+# yaml pointing at ~500 representative frames of the deployment scene
+# (Ultralytics wraps TensorRT's entropy calibrator around it). Verify
+# with trtexec that the Conv->BN->SiLU blocks really run in INT8 and
+# that mAP drops <1% before enabling in production.
+TRT_INT8 = os.environ.get('OPJECT_TRT_INT8', '0') == '1'
+TRT_CALIB_DATA = os.path.join(project_root, "calib.yaml")
+
+
+def _resolve_engine(pt_path):
+    """
+    Return a TensorRT FP16 engine for the model when CUDA is available,
+    exporting it once next to the .pt file. TensorRT fuses layers and
+    runs FP16 tensor-core kernels, which is worth 2-8x on YOLO models.
+    Falls back to the original path on CPU hosts or export failure.
+    """
+    try:
+        import torch
+        if not torch.cuda.is_available():
+            return pt_path
+    except ImportError:
+        return pt_path
+
+    if pt_path.endswith('.engine'):
+        return pt_path
+
+    engine_path = os.path.splitext(pt_path)[0] + ".engine"
+    if not os.path.exists(engine_path):
+        # Static 1x3x640x640 shape: TRT's auto-tuner bakes in fixed conv
+        # tilings and drops the reshape ops dynamic axes would need. The
+        # GPU letterbox guarantees the network always sees exactly 640.
+        try:
+            if TRT_INT8 and os.path.exists(TRT_CALIB_DATA):
+                # INT8 quadruples weight bandwidth vs FP32 and unlocks
+                # int8 tensor cores -- another ~1.3-1.6x over FP16
+                logger.info("⚙️ Exporting TensorRT INT8 engine (one-time, may take minutes)...")
+                YOLO(pt_path).export(format="engine", int8=True,
+                                     data=TRT_CALIB_DATA, imgsz=640,
+                                     dynamic=False, batch=1,
+                                     workspace=2, simplify=True)
+            else:
+                logger.info("⚙️ Exporting TensorRT FP16 engine (one-time, may take minutes)...")
+                YOLO(pt_path).export(format="engine", half=True, imgsz=640,
+                                     dynamic=False, batch=1,
+                                     workspace=2, simplify=True)
+        except Exception as e:
+            logger.warning("⚠️ TensorRT export failed, staying on PyTorch: %s", e)
+            return pt_path
+
+    return engine_path if os.path.exists(engine_path) else pt_path
+
+
+def _resolve_onnx(pt_path):
+    """
+    Middle tier for hosts without TensorRT: export the model to ONNX
+    once and run it through ONNX Runtime, whose graph fusion and
+    provider kernels are worth 3-4x over the raw .pt path on CPU.
+    Falls back to the original path when onnxruntime is missing or the
+    export fails.
+    """
+    try:
+        import onnxruntime  # noqa: F401  (Ultralytics dispatches to it)
+    except ImportError:
+        return pt_path
+
+    onnx_path = os.path.splitext(pt_path)[0] + ".onnx"
+    if not os.path.exists(onnx_path):
+        try:
+            logger.info("⚙️ Exporting ONNX model (one-time)...")
+            # Static shapes let ORT pick fixed-size fused kernels
+            YOLO(pt_path).export(format="onnx", opset=12, simplify=True,
+                                 dynamic=False, imgsz=640)
+        except Exception as e:
+            logger.warning("⚠️ ONNX export failed, staying on PyTorch: %s", e)
+            return pt_path
+
+    return onnx_path if os.path.exists(onnx_path) else pt_path
+
+# Optimized important labels - reduced set for better performance.
+# Frozen and already lowercase: the set is only consulted once, while
+# building the class-id bitmap in get_model(); per-box filtering never
+# touches strings.
+IMPORTANT_LABELS = frozenset({
     "person", "car", "bus", "dog", "cat", "chair", "bottle",
-    "cup", "book", "cell phone", "laptop", "tv", "couch", 
+    "cup", "book", "cell phone", "laptop", "tv", "couch",
     "dining table", "toilet", "door", "stairs"
-}
+})
+
+# Lazy singleton: the ~500MB weight load and CUDA context creation run
+# once, on first use (the startup warm-up thread normally pays it), so
+# importing this module stays cheap and a re-import can never reload
+_model = None
+_model_lock = threading.Lock()
+
+# Class-id bitmap computed once at load: model.names is fixed, so the
+# per-box string lower() + set lookup collapses to one boolean gather.
+# Built alongside the model in get_model().
+IMPORTANT_CLS = None
+
+
+def get_model():
+    """
+    Return the process-wide YOLO model, loading it on first call.
+    Thread-safe; concurrent first callers block on one load.
+    """
+    global _model, IMPORTANT_CLS
+
+    if _model is not None:
+        return _model
+
+    with _model_lock:
+        if _model is not None:
+            return _model
+
+        model_path = os.path.join(project_root, "models", "best.pt")
+        logger.info("🔍 Loading model from: %s", model_path)
+
+        # Check if model file exists
+        if not os.path.exists(model_path):
+            logger.warning("❌ Model file not found at: %s", model_path)
+            models_dir = os.path.join(project_root, "models")
+            if os.path.exists(models_dir):
+                logger.warning("Available files in models directory:")
+                for file in os.listdir(models_dir):
+                    logger.warning("   - %s", file)
+            else:
+                logger.warning("   Models directory doesn't exist!")
+
+            # Fallback to a pre-trained YOLOv8 model
+            logger.warning("🔄 Falling back to pre-trained YOLOv8n model")
+            model_path = "yolov8n.pt"
+
+        # Backend selection, fastest first: TensorRT engine -> ONNX
+        # Runtime -> plain PyTorch
+        model_path = _resolve_engine(model_path)
+        if model_path.endswith('.pt'):
+            model_path = _resolve_onnx(model_path)
+
+        if model_path.endswith('.engine'):
+            # Ultralytics dispatches to the TRT runtime transparently,
+            # but engines carry no task metadata, so pass it explicitly
+            model = YOLO(model_path, task="detect")
+            logger.info("✅ TensorRT engine loaded successfully")
+        elif model_path.endswith('.onnx'):
+            # Same task caveat as engines; ORT picks CUDA or CPU providers
+            model = YOLO(model_path, task="detect")
+            logger.info("✅ ONNX model loaded via ONNX Runtime")
+        else:
+            model = YOLO(model_path)
+            logger.info("✅ YOLO model loaded successfully")
+        model.overrides['verbose'] = False  # Reduce logging
+
+        IMPORTANT_CLS = np.zeros(max(model.names) + 1, dtype=bool)
+        for cid, name in model.names.items():
+            IMPORTANT_CLS[cid] = name.lower() in IMPORTANT_LABELS
+
+        _model = model
+
+    return _model
+
+# GPU preprocessing: with a fast GPU the CPU-side letterbox / HWC->CHW /
+# normalize inside Ultralytics becomes the bottleneck, so when CUDA is
+# available we upload the raw uint8 frame once and do the rest on device
+try:
+    import torch
+    import torch.nn.functional as F
+    GPU_PREPROCESS = torch.cuda.is_available()
+except ImportError:
+    torch = None
+    GPU_PREPROCESS = False
+
+MODEL_INPUT_SIZE = 640
+
+# Pinned (page-locked) staging buffer for the raw frame plus a dedicated
+# upload stream. Copying from pageable numpy memory forces the CUDA
+# driver through an internal staging buffer and serializes with compute;
+# pinning lets cudaMemcpyAsync DMA directly, and the separate stream
+# overlaps the next frame's upload with the current inference.
+_pin_buf = None
+_upload_stream = torch.cuda.Stream() if GPU_PREPROCESS else None
+
+# Opt-in CUDA Graph capture of the preprocess chain. At batch=1 kernel
+# launch overhead dominates small kernels; the upload+letterbox sequence
+# is shape-static per client, so one capture collapses its ~10 launches
+# into a single graph replay. Off by default: capture interacts badly
+# with some allocator/driver combinations, hence the env gate and the
+# eager fallback on capture failure.
+CUDA_GRAPH = GPU_PREPROCESS and os.environ.get('OPJECT_CUDA_GRAPH', '0') == '1'
+_graph = None
+_graph_failed = False
+_graph_out = None
+_graph_mapping = None
+
+# Flat 3x3 grid names, row-major, indexable as POSITIONS[row * 3 + col]
+POSITIONS = np.array([
+    "top left", "top center", "top right",
+    "middle left", "center", "middle right",
+    "bottom left", "bottom center", "bottom right"
+])
+
+# Plain-tuple view of the same table for scalar lookups: indexing a
+# tuple returns a str directly, with no numpy scalar wrapping
+_POSITIONS = tuple(POSITIONS)
+
+
+def _preprocess_ops():
+    """
+    The capture-friendly op sequence: read `_pin_buf`, letterbox +
+    BGR->RGB + normalize on device. Returns the 1x3xSxS FP16 tensor and
+    the (scale, left, top) mapping needed to project box coordinates
+    back onto the original frame. Everything here depends only on the
+    buffer's (fixed) shape, so a CUDA Graph replay of it is valid.
+    """
+    size = MODEL_INPUT_SIZE
+    t = _pin_buf.to('cuda', non_blocking=True)
+    t = t.permute(2, 0, 1).unsqueeze(0)          # 1x3xHxW, still BGR uint8
+    t = t[:, [2, 1, 0]].half() / 255.0           # RGB, FP16, 0-1
+    h, w = t.shape[2:]
+    scale = size / max(h, w)
+    nh, nw = int(round(h * scale)), int(round(w * scale))
+    t = F.interpolate(t, size=(nh, nw), mode='bilinear', align_corners=False)
+    canvas = torch.full((1, 3, size, size), 0.447, dtype=t.dtype, device=t.device)
+    top = (size - nh) // 2
+    left = (size - nw) // 2
+    canvas[:, :, top:top + nh, left:left + nw] = t
+    return canvas, (scale, left, top)
+
+
+def _preprocess_gpu(frame):
+    """
+    Stage the frame in pinned memory and run the device-side preprocess,
+    via a replayed CUDA Graph when enabled, else eagerly on the upload
+    stream.
+    """
+    global _pin_buf, _graph, _graph_failed, _graph_out, _graph_mapping
+
+    # Stage the frame in pinned memory (reused across frames; frames
+    # from one client have a constant shape, so this allocates once)
+    if _pin_buf is None or tuple(_pin_buf.shape) != frame.shape:
+        _pin_buf = torch.empty(frame.shape, dtype=torch.uint8, pin_memory=True)
+        _graph = None  # any existing capture baked in the old shape
+    _pin_buf.copy_(torch.from_numpy(frame))
+
+    if CUDA_GRAPH and not _graph_failed:
+        if _graph is None:
+            try:
+                # Warm-up run (cuDNN/cuBLAS init must not happen inside
+                # capture), then record; tensors allocated during
+                # capture live in the graph's private pool and back
+                # _graph_out on every replay
+                _preprocess_ops()
+                torch.cuda.synchronize()
+                graph = torch.cuda.CUDAGraph()
+                with torch.cuda.graph(graph):
+                    _graph_out, _graph_mapping = _preprocess_ops()
+                _graph = graph
+                logger.info("✅ CUDA Graph captured for preprocessing")
+            except Exception as e:
+                logger.warning("⚠️ CUDA Graph capture failed, staying eager: %s", e)
+                _graph_failed = True
+        if _graph is not None:
+            _graph.replay()
+            return _graph_out, _graph_mapping
+
+    with torch.cuda.stream(_upload_stream):
+        canvas, mapping = _preprocess_ops()
+
+    # Inference on the default stream must see the finished upload
+    torch.cuda.current_stream().wait_stream(_upload_stream)
+    return canvas, mapping
+
+# Motion gate: most frames of a static scene are redundant, and the
+# resize+absdiff check costs ~0.3ms vs 10-30ms of inference. Frames with
+# mean difference below the threshold reuse the last result; every Nth
+# frame runs regardless so the cache can never go stale for long.
+MOTION_DIFF_THRESHOLD = 3.0
+MOTION_FORCE_EVERY = 10
+_motion_prev = None
+_motion_frame_idx = 0
+_motion_cached = []
+
+
+def _scene_unchanged(frame):
+    """Return True when the frame barely differs from the previous one"""
+    global _motion_prev, _motion_frame_idx
+
+    small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (80, 45))
+    prev = _motion_prev
+    _motion_prev = small
+    _motion_frame_idx += 1
+
+    if prev is None or _motion_frame_idx % MOTION_FORCE_EVERY == 0:
+        return False
+    return cv2.absdiff(small, prev).mean() < MOTION_DIFF_THRESHOLD
 
 # Performance tracking
 last_detection_time = 0
@@ -52,23 +316,40 @@ def detect_objects(frame):
     """
     Detect objects in the given frame and return their positions in a 3x3 grid
     Optimized for better performance and stability
+
+    Color-space contract: `frame` is BGR uint8 exactly as produced by
+    cv2.imdecode / VideoCapture. Ultralytics performs the single
+    BGR->RGB swap on its own SIMD path, so callers must NOT pre-convert
+    -- doing so would add a full-frame copy and flip the colors twice.
     """
-    global last_detection_time, detection_count
-    
+    global last_detection_time, detection_count, _motion_cached
+
     start_time = time.time()
     
     if frame is None:
-        print("❌ No frame provided to detector")
+        logger.warning("❌ No frame provided to detector")
         return []
         
     try:
+        # Static scene: skip inference and serve the last detections
+        if _scene_unchanged(frame):
+            logger.debug("🔍 Scene unchanged, reusing cached detections")
+            return _motion_cached
+
         # Get frame dimensions
         height, width = frame.shape[:2]
-        print(f"🔍 Processing frame: {width}x{height}")
-        
+        logger.debug("🔍 Processing frame: %dx%d", width, height)
+
+        model = get_model()
+
         # Optimize detection parameters for performance
+        if GPU_PREPROCESS:
+            source, mapping = _preprocess_gpu(frame)
+        else:
+            source, mapping = frame, None
+
         results = model(
-            frame, 
+            source,
             conf=0.6,        # Increased confidence threshold
             iou=0.45,        # IoU threshold for NMS
             max_det=20,      # Limit max detections
@@ -76,147 +357,165 @@ def detect_objects(frame):
             save=False,      # Don't save results
             show=False       # Don't show results
         )
-        
-        detections = []
-        processed_boxes = []
-        
-        # Process detections with improved filtering
-        for result in results:
-            if result.boxes is not None and len(result.boxes) > 0:
-                for box in result.boxes:
-                    try:
-                        # Get confidence and class
-                        conf = float(box.conf[0])
-                        cls = int(box.cls[0])
-                        
-                        # Skip low confidence detections
-                        if conf < 0.6:
-                            continue
-                            
-                        # Get class name
-                        label = model.names[cls].lower()
-                        
-                        # Only process important objects
-                        if label not in IMPORTANT_LABELS:
-                            continue
-                        
-                        # Get bounding box coordinates
-                        x1, y1, x2, y2 = map(int, box.xyxy[0])
-                        
-                        # Validate bounding box
-                        if x2 <= x1 or y2 <= y1:
-                            continue
-                            
-                        # Calculate center point
-                        x_center = (x1 + x2) // 2
-                        y_center = (y1 + y2) // 2
-                        
-                        # Check if this detection overlaps significantly with existing ones
-                        bbox = [x1, y1, x2, y2]
-                        if not is_duplicate_detection(bbox, processed_boxes, threshold=0.3):
-                            processed_boxes.append(bbox)
-                            
-                            # Get position in 3x3 grid
-                            location = get_position(x_center, y_center, width, height)
-                            
-                            detection = {
-                                "object": label,
-                                "location": location,
-                                "confidence": round(conf, 2),
-                                "bbox": bbox
-                            }
-                            
-                            detections.append(detection)
-                            print(f"🎯 Detected: {label} ({conf:.2f}) at {location}")
-                            
-                    except Exception as e:
-                        print(f"❌ Error processing detection: {str(e)}")
-                        continue
-        
-        # Sort detections by confidence (highest first)
-        detections.sort(key=lambda x: x['confidence'], reverse=True)
-        
-        # Limit number of detections to prevent overload
-        if len(detections) > 8:
-            detections = detections[:8]
-            print(f"⚠️ Limited detections to 8 (from {len(detections)})")
-        
+
+        detections = _collect_detections(results[0], width, height, mapping)
+        _motion_cached = detections
+
         # Performance tracking
         processing_time = time.time() - start_time
         detection_count += 1
         last_detection_time = time.time()
         
-        print(f"✅ Detection completed: {len(detections)} objects in {processing_time:.2f}s")
-        
-        # Clean up memory
-        del results
-        gc.collect()
-        
+        logger.debug("✅ Detection completed: %d objects in %.2fs",
+                     len(detections), processing_time)
+
         return detections
         
     except Exception as e:
-        print(f"❌ Detection error: {str(e)}")
+        logger.error("❌ Detection error: %s", e)
         return []
 
-def is_duplicate_detection(bbox1, existing_boxes, threshold=0.3):
+def _collect_detections(result, width, height, mapping=None):
     """
-    Check if a bounding box significantly overlaps with existing detections
+    Turn one YOLO result into the filtered, sorted detection dict list
+
+    `mapping` is the (scale, left, top) letterbox transform applied by
+    _preprocess_gpu; when given, box coordinates are projected back to
+    the original frame before positions are computed.
     """
-    x1, y1, x2, y2 = bbox1
-    area1 = (x2 - x1) * (y2 - y1)
-    
-    for existing_bbox in existing_boxes:
-        ex1, ey1, ex2, ey2 = existing_bbox
-        
-        # Calculate intersection
-        ix1 = max(x1, ex1)
-        iy1 = max(y1, ey1)
-        ix2 = min(x2, ex2)
-        iy2 = min(y2, ey2)
-        
-        if ix2 > ix1 and iy2 > iy1:
-            intersection = (ix2 - ix1) * (iy2 - iy1)
-            overlap_ratio = intersection / area1
-            
-            if overlap_ratio > threshold:
-                return True
-                
-    return False
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        return []
 
-def get_position(x, y, width, height):
+    # One bulk device->host transfer per field instead of N per-box
+    # scalar syncs (each box.conf[0]/box.xyxy[0] access forces its own
+    # CUDA round-trip and Python float conversion)
+    model = get_model()
+    confs = boxes.conf.cpu().numpy()
+    clss = boxes.cls.cpu().numpy().astype(np.int32)
+    xyxy = boxes.xyxy.cpu().numpy()
+
+    # Undo the GPU-side letterbox, clamping to the frame
+    if mapping is not None:
+        scale, left, top = mapping
+        xyxy = xyxy.copy()
+        xyxy[:, [0, 2]] = np.clip((xyxy[:, [0, 2]] - left) / scale, 0, width)
+        xyxy[:, [1, 3]] = np.clip((xyxy[:, [1, 3]] - top) / scale, 0, height)
+
+    xyxy = xyxy.astype(np.int32)
+
+    # Vectorized confidence + degenerate-box + important-class filter
+    keep = (confs >= 0.6) & (xyxy[:, 2] > xyxy[:, 0]) & (xyxy[:, 3] > xyxy[:, 1])
+    keep &= IMPORTANT_CLS[clss]
+
+    # Grid cells for every box in one shot: integer center math plus a
+    # single gather from the flat position table
+    cols = np.clip((xyxy[:, 0] + xyxy[:, 2]) // 2 * 3 // width, 0, 2)
+    rows = np.clip((xyxy[:, 1] + xyxy[:, 3]) // 2 * 3 // height, 0, 2)
+    locations = POSITIONS[rows * 3 + cols]
+
+    detections = []
+
+    # Python only iterates the survivors to assemble the dict list.
+    # Overlap suppression is NMS's job (iou=0.45, max_det=20 in the
+    # model call), so no second Python-side duplicate pass is needed.
+    for i in np.flatnonzero(keep):
+        # Importance already filtered via the class-id bitmap above
+        label = model.names[int(clss[i])].lower()
+
+        x1, y1, x2, y2 = (int(v) for v in xyxy[i])
+
+        detections.append({
+            "object": label,
+            "location": str(locations[i]),
+            "confidence": round(float(confs[i]), 2),
+            "bbox": [x1, y1, x2, y2]
+        })
+
+    # Sort detections by confidence (highest first)
+    detections.sort(key=lambda x: x['confidence'], reverse=True)
+
+    # Limit number of detections to prevent overload
+    if len(detections) > 8:
+        detections = detections[:8]
+        logger.debug("⚠️ Limited detections to 8")
+
+    return detections
+
+# The TensorRT/ONNX exports above are built with a static batch of 1;
+# their backends reject N-frame batches, so once a batched call fails we
+# stop retrying and serve batches frame by frame
+_batch_failed = False
+
+def detect_objects_batch(frames):
     """
-    Convert pixel coordinates to 3x3 grid position with improved accuracy
+    Detect objects in several frames with a single YOLO call.
+    Returns one detection list per input frame, in order.
     """
+    global last_detection_time, detection_count, _batch_failed
+
+    if not frames:
+        return []
+
+    if len(frames) == 1:
+        # Under low load the batcher mostly dispatches one frame at a
+        # time; route it through the single-frame path so it still gets
+        # motion gating and the pinned-buffer GPU preprocess
+        return [detect_objects(frames[0])]
+
+    if _batch_failed:
+        return [detect_objects(frame) for frame in frames]
+
     try:
-        # Add small margin to prevent edge cases
-        margin = 0.05  # 5% margin
-        
-        # Calculate grid position with margins
-        col_width = width / 3
-        row_height = height / 3
-        
-        col = int(x / col_width)
-        row = int(y / row_height)
-        
-        # Ensure bounds
-        col = max(0, min(2, col))
-        row = max(0, min(2, row))
-        
-        # Position names for 3x3 grid
-        positions = [
-            ["top left", "top center", "top right"],
-            ["middle left", "center", "middle right"],
-            ["bottom left", "bottom center", "bottom right"]
-        ]
-        
-        position = positions[row][col]
-        print(f"📍 Position: ({x}, {y}) -> grid[{row}][{col}] -> {position}")
-        
-        return position
-        
+        results = get_model()(
+            frames,
+            conf=0.6,
+            iou=0.45,
+            max_det=20,
+            verbose=False,
+            save=False,
+            show=False
+        )
+
+        batch_detections = []
+        for frame, result in zip(frames, results):
+            height, width = frame.shape[:2]
+            batch_detections.append(_collect_detections(result, width, height))
+
+        detection_count += len(frames)
+        last_detection_time = time.time()
+
+        return batch_detections
+
     except Exception as e:
-        print(f"❌ Position calculation error: {str(e)}")
-        return "center"  # Default fallback
+        # Expected on static-shape engine/ONNX backends, which only
+        # accept 1x3x640x640; degrade to per-frame inference rather
+        # than handing every request in the batch an empty result
+        logger.warning("Batch detection failed (%s); falling back to per-frame", e)
+        _batch_failed = True
+        return [detect_objects(frame) for frame in frames]
+
+def get_position(x, y, width, height):
+    """
+    Convert pixel coordinates to a 3x3 grid position name
+
+    Pure integer math with simple bound clamps: no try/except (setting
+    up a handler in a hot function defeats CPython's inline caches), no
+    per-call list construction, one flat tuple index.
+    """
+    col = (x * 3) // width
+    row = (y * 3) // height
+
+    if col > 2:
+        col = 2
+    elif col < 0:
+        col = 0
+    if row > 2:
+        row = 2
+    elif row < 0:
+        row = 0
+
+    return _POSITIONS[row * 3 + col]
 
 def get_detection_stats():
     """
@@ -225,5 +524,5 @@ def get_detection_stats():
     return {
         "total_detections": detection_count,
         "last_detection_time": last_detection_time,
-        "model_loaded": model is not None
+        "model_loaded": _model is not None
     }
\ No newline at end of file
@@ -1,19 +1,29 @@
 # back_end_process/voice_api.py - New multi-method voice system
 
 from flask import Blueprint, request, jsonify
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import base64
+import io
+import logging
 import os
-import sys
+import shutil
 import subprocess
 import threading
 import time
-import queue
-import tempfile
+import collections
 import platform
 
 voice_bp = Blueprint('voice', __name__)
 
+logger = logging.getLogger(__name__)
+
 # Voice system configuration
-voice_queue = queue.Queue(maxsize=5)
+# Single-producer/single-consumer buffer: deque append/popleft are
+# atomic on CPython and maxlen auto-drops the oldest entry, so no mutex
+# or Full/Empty handling is needed; the Event wakes the worker on put
+voice_queue = collections.deque(maxlen=5)
+voice_event = threading.Event()
 voice_thread = None
 voice_active = True
 last_announcement_time = 0
@@ -35,137 +45,339 @@ class VoiceMethod:
         """Speak the given text"""
         return False
 
-class WindowsSAPIVoice(VoiceMethod):
-    """Windows SAPI voice using PowerShell"""
+    def synthesize(self, text):
+        """
+        Render text to playable audio for the two-stage pipeline, or
+        None when this method can only synth+play monolithically
+        """
+        return None
+
+    def play(self, audio):
+        """Play audio previously returned by synthesize"""
+        return False
+
+class PiperClipVoice(VoiceMethod):
+    """
+    Piper TTS with pre-synthesized clips.
+
+    The announcement set is closed (important labels x 9 grid cells), so
+    every message can be rendered to a WAV once and played back with
+    microsecond latency afterwards - no TTS engine in the hot path at
+    all. Clips are built in a background thread at startup; messages not
+    cached yet simply fall through to the next voice method.
+    """
     def __init__(self):
-        super().__init__("Windows SAPI")
-        
+        super().__init__("Piper clips")
+        self.cache_dir = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "voice_cache")
+        self.clips = {}  # message text -> wav path
+        self.piper_model = os.environ.get('PIPER_MODEL', 'en_US-lessac-medium')
+
+    def _clip_path(self, message):
+        safe = "".join(c if c.isalnum() else "_" for c in message.lower())
+        return os.path.join(self.cache_dir, f"{safe}.wav")
+
+    def _synthesize(self, message, path):
+        subprocess.run(
+            ['piper', '--model', self.piper_model, '--output_file', path],
+            input=message.encode(), capture_output=True, timeout=30)
+        return os.path.exists(path)
+
+    def _prebuild(self):
+        """Render the full (label, location) announcement set to disk"""
+        from .config import get_config
+        cfg = get_config('default')
+
+        locations = [p for row in cfg.GRID_POSITIONS for p in row]
+        for label in sorted(cfg.IMPORTANT_LABELS):
+            for location in locations:
+                message = f"{label.title()} detected in {location}"
+                path = self._clip_path(message)
+                if not os.path.exists(path):
+                    try:
+                        if not self._synthesize(message, path):
+                            continue
+                    except Exception:
+                        continue
+                self.clips[message] = path
+        logger.info("🔊 Piper clip cache ready: %d clips", len(self.clips))
+
     def test(self):
-        if platform.system() != "Windows":
+        if shutil.which('piper') is None:
             return False
         try:
-            # Test PowerShell SAPI
-            cmd = ['powershell', '-Command', 'Add-Type -AssemblyName System.Speech; (New-Object System.Speech.Synthesis.SpeechSynthesizer).Speak("test")']
-            result = subprocess.run(cmd, capture_output=True, timeout=3, creationflags=subprocess.CREATE_NO_WINDOW)
-            self.available = result.returncode == 0
-            return self.available
-        except:
+            import sounddevice  # noqa: F401
+            import soundfile    # noqa: F401
+        except ImportError:
             return False
-            
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Synthesis of ~500 clips takes a while; don't block startup
+        threading.Thread(target=self._prebuild, daemon=True).start()
+        self.available = True
+        return True
+
     def speak(self, text):
+        path = self.clips.get(text)
+        if path is None:
+            # Not in the closed set (or not rendered yet) - let the
+            # worker fall through to the next method
+            return False
         try:
-            # Escape text for PowerShell
-            escaped_text = text.replace('"', '`"').replace("'", "''")
-            cmd = [
-                'powershell', '-Command', 
-                f'Add-Type -AssemblyName System.Speech; $synth = New-Object System.Speech.Synthesis.SpeechSynthesizer; $synth.Rate = 2; $synth.Volume = 80; $synth.Speak("{escaped_text}")'
-            ]
-            subprocess.run(cmd, timeout=5, creationflags=subprocess.CREATE_NO_WINDOW)
+            import sounddevice
+            import soundfile
+            data, rate = soundfile.read(path, dtype='int16')
+            sounddevice.play(data, rate)
+            sounddevice.wait()
             return True
         except Exception as e:
-            print(f"❌ Windows SAPI error: {e}")
+            logger.error("❌ Piper clip error: %s", e)
             return False
 
-class EdgeTTSVoice(VoiceMethod):
-    """Microsoft Edge TTS using edge-tts"""
+class WindowsSAPIVoice(VoiceMethod):
+    """
+    Windows SAPI through a persistent in-process COM voice, falling
+    back to one long-lived PowerShell process fed over stdin when
+    pywin32 is missing - either way the CLR/System.Speech load happens
+    once per process lifetime, never per message.
+    """
+
+    _PS_SETUP = ('Add-Type -AssemblyName System.Speech; '
+                 '$s = New-Object System.Speech.Synthesis.SpeechSynthesizer; '
+                 '$s.Rate = 2; $s.Volume = 80;\n')
+
     def __init__(self):
-        super().__init__("Edge TTS")
-        
+        super().__init__("Windows SAPI")
+        self.voice = None
+        self.use_com = False
+        self.proc = None
+
     def test(self):
+        if platform.system() != "Windows":
+            return False
         try:
-            import edge_tts
+            import win32com.client  # noqa: F401  (pywin32 presence check)
+            self.use_com = True
             self.available = True
             return True
         except ImportError:
             try:
-                # Try to install edge-tts
-                subprocess.run([sys.executable, '-m', 'pip', 'install', 'edge-tts'], 
-                             capture_output=True, timeout=30)
-                import edge_tts
+                self._start_proc()
                 self.available = True
                 return True
-            except:
+            except Exception:
                 return False
-                
+
+    def _start_proc(self):
+        self.proc = subprocess.Popen(
+            ['powershell', '-NoProfile', '-Command', '-'],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW)
+        self.proc.stdin.write(self._PS_SETUP.encode())
+        self.proc.stdin.flush()
+
+    def _speak_proc(self, text):
+        # Text crosses the pipe base64-encoded: the alphabet contains
+        # no quotes or backticks, so no message content can break out
+        # of the Speak() argument, and PowerShell never has to re-parse
+        # variable-length escaped strings
+        b64 = base64.b64encode(text.encode('utf-8')).decode('ascii')
+        line = ('$s.Speak([System.Text.Encoding]::UTF8.GetString('
+                f'[System.Convert]::FromBase64String("{b64}")))\n').encode()
+        # One retry: a dead/broken-pipe process is restarted once
+        for _ in range(2):
+            try:
+                if self.proc is None or self.proc.poll() is not None:
+                    self._start_proc()
+                self.proc.stdin.write(line)
+                self.proc.stdin.flush()
+                return True
+            except Exception as e:
+                logger.error("❌ Windows SAPI pipe error: %s", e)
+                self.proc = None
+        return False
+
+    def _get_voice(self):
+        # COM objects are apartment-bound, so create the voice lazily in
+        # the thread that actually speaks (the voice worker) and keep it
+        # for the thread's lifetime. Spawning powershell.exe per
+        # utterance cost hundreds of ms of process + CLR load before any
+        # audio came out; the in-process dispatch pays that once.
+        if self.voice is None:
+            import pythoncom
+            import win32com.client
+            pythoncom.CoInitialize()
+            self.voice = win32com.client.Dispatch("SAPI.SpVoice")
+            self.voice.Rate = 2
+            self.voice.Volume = 80
+        return self.voice
+
     def speak(self, text):
+        if not self.use_com:
+            return self._speak_proc(text)
+        try:
+            self._get_voice().Speak(text)
+            return True
+        except Exception as e:
+            logger.error("❌ Windows SAPI error: %s", e)
+            self.voice = None  # rebuild on the next attempt
+            return False
+
+class EdgeTTSVoice(VoiceMethod):
+    """Microsoft Edge TTS using edge-tts"""
+    def __init__(self):
+        super().__init__("Edge TTS")
+        self.loop = None
+
+    def _ensure_loop(self):
+        # One event loop for the lifetime of the method: building a
+        # fresh loop per utterance threw away the TLS/WebSocket state
+        # and re-handshook Azure every time
+        if self.loop is None:
+            import asyncio
+            import atexit
+            self.loop = asyncio.new_event_loop()
+            threading.Thread(target=self.loop.run_forever, daemon=True).start()
+            atexit.register(
+                lambda: self.loop.call_soon_threadsafe(self.loop.stop))
+        return self.loop
+
+    async def _speak_async(self, text):
+        import edge_tts
+
+        voice = "en-US-AriaNeural"  # Fast, clear voice
+        communicate = edge_tts.Communicate(text, voice, rate="+20%")
+
+        # Collect the audio chunks in memory: no temp file, no disk
+        # flush, no player subprocess per utterance
+        buf = bytearray()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                buf.extend(chunk["data"])
+        return bytes(buf)
+
+    def test(self):
+        try:
+            import edge_tts  # noqa: F401
+            self.available = True
+            return True
+        except ImportError:
+            # Never install packages at runtime; edge-tts is declared
+            # in requirements.txt for deployments that want this tier
+            return False
+
+    def synthesize(self, text):
         try:
-            import edge_tts
             import asyncio
-            
-            async def speak_async():
-                voice = "en-US-AriaNeural"  # Fast, clear voice
-                communicate = edge_tts.Communicate(text, voice, rate="+20%")
-                
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-                    await communicate.save(tmp_file.name)
-                    
-                    # Play the audio file
-                    if platform.system() == "Windows":
-                        subprocess.run(['powershell', '-c', f'(New-Object Media.SoundPlayer "{tmp_file.name}").PlaySync()'], 
-                                     timeout=10, creationflags=subprocess.CREATE_NO_WINDOW)
-                    else:
-                        # For Linux/Mac - would need additional audio players
-                        pass
-                    
-                    # Clean up
-                    try:
-                        os.unlink(tmp_file.name)
-                    except:
-                        pass
-            
-            # Run async function
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(speak_async())
-            loop.close()
+
+            # Submit to the persistent loop; synthesis runs there while
+            # the calling thread waits for the bytes
+            future = asyncio.run_coroutine_threadsafe(
+                self._speak_async(text), self._ensure_loop())
+            return future.result(timeout=10) or None
+        except Exception as e:
+            logger.error("❌ Edge TTS error: %s", e)
+            return None
+
+    def play(self, audio):
+        try:
+            # Decode and play straight from memory
+            import sounddevice
+            import soundfile
+            data, rate = soundfile.read(io.BytesIO(audio))
+            sounddevice.play(data, rate)
+            sounddevice.wait()
             return True
-            
         except Exception as e:
-            print(f"❌ Edge TTS error: {e}")
+            logger.error("❌ Edge TTS error: %s", e)
             return False
 
+    def speak(self, text):
+        audio = self.synthesize(text)
+        return audio is not None and self.play(audio)
+
 class SimplePyTTSX3Voice(VoiceMethod):
-    """Simplified pyttsx3 implementation"""
+    """
+    Simplified pyttsx3 implementation with a small engine pool.
+
+    pyttsx3.init() costs 200-800ms (COM init, voice enumeration), so
+    instead of rebuilding the engine inline after every speech error,
+    keep initialized engines and rotate: a broken engine is discarded
+    and its slot refilled off the error path. Engines are only ever
+    created from speak(), i.e. on the voice worker thread -- like the
+    COM object in WindowsSAPIVoice, they are apartment-bound to the
+    thread that made them, so building them on a probe thread that
+    immediately exits would leave speak() driving dead engines.
+    """
     def __init__(self):
         super().__init__("Simple pyttsx3")
-        self.engine = None
-        
+        self._pool = collections.deque(maxlen=2)
+
+    def _new_engine(self):
+        import pyttsx3
+        engine = pyttsx3.init()
+        engine.setProperty('rate', 200)
+        engine.setProperty('volume', 0.8)
+        voices = engine.getProperty('voices')
+        if voices:
+            engine.setProperty('voice', voices[0].id)
+        # External loop: runAndWait() starts and tears down the
+        # driver's event loop (~40-80ms of SAPI message-pump setup) on
+        # every call. Start the loop once per engine and drive
+        # iterate() ourselves in speak() instead.
+        engine.startLoop(False)
+        return engine
+
+    @staticmethod
+    def _discard(engine):
+        """Shut a broken engine down without raising"""
+        try:
+            engine.endLoop()
+        except Exception:
+            pass
+        try:
+            engine.stop()
+        except Exception:
+            pass
+
     def test(self):
+        # Importability only -- no engine construction here, since
+        # probes run on short-lived executor threads (see class note)
         try:
-            import pyttsx3
-            self.engine = pyttsx3.init()
-            self.engine.setProperty('rate', 200)
-            self.engine.setProperty('volume', 0.8)
-            
-            # Quick test without runAndWait
-            voices = self.engine.getProperty('voices')
-            if voices:
-                self.engine.setProperty('voice', voices[0].id)
-            
+            import pyttsx3  # noqa: F401
             self.available = True
             return True
         except Exception as e:
-            print(f"❌ pyttsx3 test failed: {e}")
+            logger.warning("❌ pyttsx3 test failed: %s", e)
             return False
-            
+
     def speak(self, text):
-        if not self.engine:
-            return False
         try:
-            # Simple approach - just say and run
-            self.engine.say(text)
-            self.engine.runAndWait()
+            engine = self._pool.popleft()
+        except IndexError:
+            try:
+                engine = self._new_engine()
+            except Exception as e:
+                logger.error("❌ pyttsx3 init failed: %s", e)
+                return False
+
+        try:
+            engine.say(text)
+            engine.iterate()
+            while engine.isBusy():
+                engine.iterate()
+                time.sleep(0.01)
+            self._pool.append(engine)  # still healthy, back in the pool
             return True
         except Exception as e:
-            print(f"❌ Simple pyttsx3 error: {e}")
-            # Try to reinitialize
+            logger.error("❌ Simple pyttsx3 error: %s", e)
+            # Discard the broken engine and refill the slot; the next
+            # message speaks on the spare without waiting for init
+            self._discard(engine)
             try:
-                self.engine.stop()
-                import pyttsx3
-                self.engine = pyttsx3.init()
-                self.engine.setProperty('rate', 200)
-                self.engine.setProperty('volume', 0.8)
-            except:
+                self._pool.append(self._new_engine())
+            except Exception:
                 pass
             return False
 
@@ -185,101 +397,177 @@ class WebBrowserVoice(VoiceMethod):
         return True
 
 def initialize_voice_methods():
-    """Initialize and test all available voice methods"""
-    global available_methods, current_voice_method
-    
-    print("🔍 Testing voice methods...")
-    
-    methods = [
+    """
+    Register the voice methods in priority order. Probing is deferred
+    to first use: WindowsSAPI and pyttsx3 tests cost seconds of
+    subprocess/COM work, which used to run at module import and stall
+    Flask startup.
+    """
+    global available_methods, current_voice_method, _tested_methods_cache
+
+    available_methods = [
+        PiperClipVoice(),  # Cached clips first: no synthesis latency
         WindowsSAPIVoice(),
-        EdgeTTSVoice(), 
+        EdgeTTSVoice(),
         SimplePyTTSX3Voice(),
         WebBrowserVoice()  # Always last as fallback
     ]
-    
-    available_methods = []
-    for method in methods:
-        print(f"   Testing {method.name}...")
-        if method.test():
-            available_methods.append(method)
-            print(f"   ✅ {method.name} available")
+    current_voice_method = None
+    _tested_methods_cache = None
+    return True
+
+# Probed-and-working methods, filled on the first spoken message
+_tested_methods_cache = None
+
+# Two-stage pipeline state: while one utterance occupies the audio
+# device, the next queued message's synthesis runs on this executor so
+# its latency hides behind playback instead of adding to it
+synth_executor = ThreadPoolExecutor(max_workers=1,
+                                    thread_name_prefix='voice-synth')
+_prefetched = None  # (method, message, future) or None
+
+def _tested_methods():
+    """Probe the registered methods once and cache the survivors"""
+    global _tested_methods_cache, current_voice_method
+
+    if _tested_methods_cache is None:
+        logger.info("🔍 Testing voice methods...")
+
+        def _probe(method):
+            logger.debug("   Testing %s...", method.name)
+            try:
+                return method.test()
+            except Exception as e:
+                logger.warning("   ❌ %s test error: %s", method.name, e)
+                return False
+
+        # Probe concurrently: total latency is max(tests) instead of
+        # sum(tests), and the slow probes (subprocess spawn, COM init)
+        # dominate. ex.map preserves priority order in the results.
+        with ThreadPoolExecutor(max_workers=len(available_methods)) as ex:
+            results = list(ex.map(_probe, available_methods))
+
+        working = []
+        for method, ok in zip(available_methods, results):
+            if ok:
+                working.append(method)
+                logger.info("   ✅ %s available", method.name)
+            else:
+                logger.info("   ❌ %s not available", method.name)
+        _tested_methods_cache = working
+        if working:
+            current_voice_method = working[0]
+            logger.info("🔊 Using voice method: %s", current_voice_method.name)
         else:
-            print(f"   ❌ {method.name} not available")
-    
-    if available_methods:
-        current_voice_method = available_methods[0]
-        print(f"🔊 Using voice method: {current_voice_method.name}")
-        return True
-    else:
-        print("❌ No voice methods available")
-        return False
+            logger.warning("❌ No voice methods available")
+    return _tested_methods_cache
+
+def _start_prefetch(method):
+    """Submit synthesis of the next waiting message, if any"""
+    global _prefetched
+    nxt = voice_queue[0] if voice_queue else None
+    if nxt is not None:
+        _prefetched = (method, nxt, synth_executor.submit(method.synthesize, nxt))
 
 def voice_worker():
     """Voice worker thread"""
-    global voice_active, last_announcement_time, current_voice_method
+    global voice_active, current_voice_method, _tested_methods_cache, _prefetched
     
-    print("🎤 Voice worker started")
+    logger.info("🎤 Voice worker started")
     
     while voice_active:
         try:
             # Get message
             try:
-                message = voice_queue.get(timeout=1.0)
-            except queue.Empty:
+                message = voice_queue.popleft()
+            except IndexError:
+                voice_event.wait(timeout=1.0)
+                voice_event.clear()
                 continue
-                
+
             if message is None:  # Shutdown signal
                 break
-                
-            # Check cooldown
-            current_time = time.time()
-            if current_time - last_announcement_time < announcement_cooldown:
-                print(f"🕐 Cooldown active, skipping: {message[:30]}...")
-                voice_queue.task_done()
-                continue
-            
+
+            # Cooldown is enforced once, at enqueue time; anything that
+            # made it into the queue should be spoken
+
+            # Merge whatever else is waiting into one utterance: the
+            # per-utterance engine overhead is fixed, so speaking
+            # "A. B. C" once beats three engine round-trips on bursts
+            extras = []
+            while voice_queue and len(extras) < 3:
+                extra = voice_queue.popleft()
+                if extra is None:
+                    voice_queue.appendleft(None)  # keep the shutdown signal
+                    break
+                extras.append(extra)
+            if extras:
+                message = ". ".join([message] + extras)
+                if len(message) > 100:
+                    message = message[:97] + "..."
+
             # Try to speak
             success = False
-            for method in available_methods:
+
+            # A prefetched synthesis for exactly this message (only
+            # possible when no merge happened) skips straight to play
+            pre, _prefetched = _prefetched, None
+            if pre is not None and pre[1] == message:
+                method, _, future = pre
                 try:
-                    print(f"🔊 Trying {method.name}: {message[:50]}...")
-                    success = method.speak(message)
-                    if success:
+                    audio = future.result(timeout=10)
+                except Exception:
+                    audio = None
+                if audio is not None:
+                    _start_prefetch(method)
+                    if method.play(audio):
                         current_voice_method = method
-                        last_announcement_time = current_time
-                        print(f"✅ Spoke with {method.name}")
-                        break
-                    else:
-                        print(f"⚠️ {method.name} failed, trying next...")
-                except Exception as e:
-                    print(f"❌ {method.name} error: {e}")
-                    continue
+                        success = True
+
+            if not success:
+                for method in _tested_methods():
+                    try:
+                        logger.debug("🔊 Trying %s: %.50s...", method.name, message)
+                        audio = method.synthesize(message)
+                        if audio is not None:
+                            # Overlap: render the next queued message
+                            # while this one plays
+                            _start_prefetch(method)
+                            success = method.play(audio)
+                        else:
+                            success = method.speak(message)
+                        if success:
+                            current_voice_method = method
+                            logger.debug("✅ Spoke with %s", method.name)
+                            break
+                        else:
+                            logger.debug("⚠️ %s failed, trying next...", method.name)
+                    except Exception as e:
+                        logger.error("❌ %s error: %s", method.name, e)
+                        continue
             
             if not success:
-                print(f"❌ All voice methods failed for: {message[:30]}...")
-                
-            voice_queue.task_done()
+                logger.warning("❌ All voice methods failed for: %.30s...", message)
+                # Re-probe on the next message; a method may recover
+                _tested_methods_cache = None
+
             time.sleep(0.1)
-            
+
         except Exception as e:
-            print(f"❌ Voice worker error: {e}")
-            try:
-                voice_queue.task_done()
-            except:
-                pass
+            logger.error("❌ Voice worker error: %s", e)
             time.sleep(0.5)
     
-    print("🔇 Voice worker stopped")
+    logger.info("🔇 Voice worker stopped")
 
 def start_voice_system():
     """Start the voice system"""
     global voice_thread, voice_active
     
-    print("🚀 Starting new voice system...")
+    logger.info("🚀 Starting new voice system...")
     
     # Initialize voice methods
     if not initialize_voice_methods():
-        print("❌ No voice methods available")
+        logger.warning("❌ No voice methods available")
         return False
     
     # Clear queue
@@ -293,88 +581,131 @@ def start_voice_system():
         
         time.sleep(0.2)
         if voice_thread.is_alive():
-            print("✅ Voice system started")
+            logger.info("✅ Voice system started")
             return True
         else:
-            print("❌ Voice thread failed")
+            logger.error("❌ Voice thread failed")
             return False
     
     return True
 
 def clear_queue():
     """Clear the voice queue"""
-    count = 0
-    try:
-        while not voice_queue.empty():
-            voice_queue.get_nowait()
-            voice_queue.task_done()
-            count += 1
-        if count > 0:
-            print(f"🧹 Cleared {count} voice messages")
-    except:
-        pass
+    count = len(voice_queue)
+    voice_queue.clear()
+    if count > 0:
+        logger.debug("🧹 Cleared %d voice messages", count)
 
 def stop_voice_system():
     """Stop the voice system"""
     global voice_active, voice_thread
     
-    print("🛑 Stopping voice system...")
+    logger.info("🛑 Stopping voice system...")
     voice_active = False
     
     clear_queue()
-    try:
-        voice_queue.put(None, timeout=0.5)
-    except:
-        pass
+    voice_queue.append(None)
+    voice_event.set()
     
     if voice_thread and voice_thread.is_alive():
         voice_thread.join(timeout=2.0)
     
-    print("✅ Voice system stopped")
+    logger.info("✅ Voice system stopped")
+
+# Recently announced (object, location) pairs with their timestamps.
+# Successive frames keep re-reporting the same object in the same grid
+# cell; dropping repeats here skips the formatting and queue work too.
+_recent_announcements = {}
+_recent_ttl = 5.0
+_recent_calls = 0
+
+# Exact-message guard: catches repeats the pair-level dedup can't see
+# (e.g. "system"/"object" calls that pass the full message as location).
+# The lock keeps the message/timestamp pair consistent across Flask
+# request threads and the worker.
+_last_msg = None
+_last_msg_time = 0.0
+_dedup_ttl = 3.0
+_dedup_lock = threading.Lock()
+
+def _clean(s):
+    """
+    Normalize a label for speech, with a fast path: detector labels are
+    usually already trimmed, space-separated and capitalized, so skip
+    the three intermediate string allocations when nothing would change.
+    """
+    if '_' not in s and s == s.strip() and (not s or s[0].isupper()):
+        return s
+    return s.replace('_', ' ').strip().title()
+
+
+@lru_cache(maxsize=512)
+def _format_message(object_name, location):
+    """
+    Build the spoken message for a detection.
+
+    The (object, location) vocabulary is small and highly repetitive,
+    so the title-casing, f-string build and truncation are memoized;
+    repeat pairs cost one dict lookup on short ASCII keys.
+    """
+    if object_name.lower() in ("system", "object"):
+        message = location
+    else:
+        message = f"{_clean(object_name)} detected in {location}"
+
+    # Limit length
+    if len(message) > 60:
+        message = message[:57] + "..."
+    return message
+
 
 def speak_detection(object_name, location):
     """Add message to voice queue"""
-    global last_announcement_time
-    
+    global last_announcement_time, _recent_calls
+
     if not available_methods:
         return False
-        
-    # Check cooldown
-    current_time = time.time()
+
+    # Check cooldown; monotonic time is immune to wall-clock jumps
+    current_time = time.monotonic()
     if current_time - last_announcement_time < announcement_cooldown:
         return False
-        
-    # Format message
-    if object_name.lower() == "system":
-        message = location
-    elif object_name.lower() == "object":
-        message = location
-    else:
-        message = f"{object_name.title()} detected in {location}"
-    
-    # Limit length
-    if len(message) > 60:
-        message = message[:57] + "..."
-    
-    try:
-        # Clear if queue is getting full
-        if voice_queue.qsize() >= 3:
-            clear_queue()
-        
-        voice_queue.put(message, block=False)
-        print(f"📢 Queued: {message}")
-        return True
-        
-    except queue.Full:
-        clear_queue()
-        try:
-            voice_queue.put(message, block=False)
-            return True
-        except:
-            return False
-    except Exception as e:
-        print(f"❌ Queue error: {e}")
+
+    # Drop repeats of the same object in the same cell within the TTL
+    key = (object_name.lower(), location)
+    if current_time - _recent_announcements.get(key, 0) < _recent_ttl:
         return False
+    _recent_announcements[key] = current_time
+
+    # Evict stale entries occasionally so the dict can't grow unbounded
+    _recent_calls += 1
+    if _recent_calls % 1000 == 0:
+        cutoff = current_time - 30.0
+        for stale in [k for k, t in _recent_announcements.items() if t < cutoff]:
+            del _recent_announcements[stale]
+
+    message = _format_message(object_name, location)
+
+    # Identical message inside the TTL: report success without queueing
+    # (it was just spoken, or is about to be)
+    global _last_msg, _last_msg_time
+    with _dedup_lock:
+        if message == _last_msg and current_time - _last_msg_time < _dedup_ttl:
+            return True
+        _last_msg = message
+        _last_msg_time = current_time
+
+    # Newest wins under pressure: when the ring is full, maxlen evicts
+    # the oldest entry on append, so a backlog sheds stale detections
+    # while the freshest (most relevant) ones always survive -- unlike
+    # the old clear-everything cliff at 3 queued messages.
+    # The cooldown clock starts at enqueue: slightly early, but it
+    # spares the worker a wake-up just to drop the message.
+    last_announcement_time = current_time
+    voice_queue.append(message)
+    voice_event.set()
+    logger.debug("📢 Queued: %s", message)
+    return True
 
 # Flask routes
 @voice_bp.route('/api/speak', methods=['POST'])
@@ -392,12 +723,11 @@ def speak():
             return jsonify({'error': 'Missing data'}), 400
         
         success = speak_detection(object_name, location)
-        
-        return jsonify({
-            'success': success,
-            'method': current_voice_method.name if current_voice_method else 'None',
-            'queue_size': voice_queue.qsize()
-        })
+
+        # 202 Accepted with a minimal body: synthesis is asynchronous
+        # and detectors POST here at frame rate, so don't assemble
+        # status per request - that's what /api/voice_status is for
+        return jsonify({'accepted': success}), 202
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -408,9 +738,9 @@ def voice_status():
     return jsonify({
         'available_methods': [m.name for m in available_methods],
         'current_method': current_voice_method.name if current_voice_method else None,
-        'queue_size': voice_queue.qsize(),
+        'queue_size': len(voice_queue),
         'thread_alive': voice_thread.is_alive() if voice_thread else False,
-        'cooldown_remaining': max(0, announcement_cooldown - (time.time() - last_announcement_time))
+        'cooldown_remaining': max(0, announcement_cooldown - (time.monotonic() - last_announcement_time))
     })
 
 @voice_bp.route('/api/voice_test', methods=['POST'])
@@ -430,13 +760,14 @@ def voice_restart():
     success = start_voice_system()
     return jsonify({'success': success})
 
-# Initialize on import
-print("🔊 Initializing voice system...")
-voice_initialized = start_voice_system()
-if voice_initialized:
-    print("✅ Voice system ready")
-else:
-    print("⚠️ Voice system has issues but will try fallbacks")
+def init_voice(app=None):
+    """
+    Start the voice system in the background. Called by the app factory
+    after blueprint registration; importing this module no longer spins
+    up threads or probes TTS engines, which used to stall every Flask
+    worker boot for seconds.
+    """
+    threading.Thread(target=start_voice_system, daemon=True).start()
 
 # Cleanup
 import atexit
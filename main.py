@@ -1,41 +1,215 @@
 from ultralytics import YOLO
 import cv2
+import numpy as np
 from gtts import gTTS
+import collections
+from functools import lru_cache
+from io import BytesIO
+import os
+import queue
+import signal
 import threading
 import time
-import os
-from playsound import playsound
 from deep_sort_realtime.deepsort_tracker import DeepSort
 
-model = YOLO('yolov8x.pt')
+from back_end_process.config import get_config
+
+_CFG = get_config('default')
+
+try:
+    from numba import njit
+except ImportError:
+    # Same fallback as app/routes_kernels.py: run the plain Python
+    # body when numba is absent
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
 
 important_labels = {"person", "car", "bus", "dog", "door", "book", "chair", "stairs", "table", "cup", "bottle", "knife", "traffic light"}
 
 
 threshold_object = 0.8
 
-tracker = DeepSort(max_age=30)
 
-cap = cv2.VideoCapture(0)
+class Tier:
+    """Model sizes, fastest first; the loop drops a tier when it falls
+    behind its frame budget"""
+    NANO = 0
+    SMALL = 1
+    MEDIUM = 2
+
+
+_TIER_WEIGHTS = ('yolov8n.pt', 'yolov8s.pt', 'yolov8m.pt')
+
+_tier_models = {}
+_tracker = None
+
+
+def _resolve_weights(pt_path):
+    """
+    Prefer a TensorRT FP16 engine sitting next to the .pt weights,
+    exporting it on first launch when a CUDA device is present. The
+    engine gets layer fusion and tensor-core FP16 execution that the
+    eager PyTorch backend leaves on the table; detector.py does the
+    same for the web app.
+    """
+    engine_path = os.path.splitext(pt_path)[0] + '.engine'
+    if os.path.exists(engine_path):
+        return engine_path
+    try:
+        import torch
+        if not torch.cuda.is_available():
+            return pt_path
+        YOLO(pt_path).export(format='engine', half=True, imgsz=640,
+                             dynamic=False, batch=1)
+        if os.path.exists(engine_path):
+            return engine_path
+    except Exception as e:
+        print("TensorRT export failed, using PyTorch weights:", e)
+    return pt_path
+
+
+def _get_model(tier=Tier.MEDIUM):
+    """
+    Load and warm one detector tier, on first use. Importing this
+    module no longer pays the multi-second YOLO load, and the live
+    loop starts with fused layers and autotuned kernels instead of
+    hitting both costs on its first real frame. Tiers load lazily
+    rather than all three upfront: a tier the latency governor never
+    reaches costs nothing.
+    """
+    model = _tier_models.get(tier)
+    if model is None:
+        weights = _resolve_weights(_TIER_WEIGHTS[tier])
+        if weights.endswith('.engine'):
+            model = YOLO(weights, task='detect')
+        else:
+            model = YOLO(weights)
+            model.fuse()
+        dummy = np.zeros((640, 640, 3), np.uint8)
+        for _ in range(2):
+            model(dummy, verbose=False)
+        # Compile the cell-assignment kernel while we're warming up
+        _assign_cells(np.zeros((1, 4)), 640, 480)
+        _tier_models[tier] = model
+    return model
+
+
+def _class_filter(model):
+    """Keep-class ids for predict(), plus a bool mask and an id->label
+    table so the per-box path never hashes a string"""
+    names = model.names
+    keep_ids = [i for i, name in names.items() if name in important_labels]
+    keep_mask = np.zeros(len(names), dtype=bool)
+    keep_mask[keep_ids] = True
+    label_table = tuple(names[i] for i in range(len(names)))
+    return keep_ids, keep_mask, label_table
+
+
+def _get_tracker():
+    global _tracker
+    if _tracker is None:
+        _tracker = DeepSort(max_age=30)
+    return _tracker
+
 
-last_spoken_labels = set()
-last_spoken_ids = set()
-last_spoken_time = time.time()
 is_speaking = False
 mute = False  # Set to True if you want to disable voice
 
+# One long-lived worker drains this instead of a fresh thread per
+# announcement; when scenes change faster than speech, put_nowait
+# drops the overflow rather than stacking threads
+_voice_q = queue.Queue(maxsize=_CFG.VOICE_QUEUE_SIZE)
+
+
+def _voice_worker():
+    while True:
+        labels = _voice_q.get()
+        speak_labels_gtts(labels)
+
+@njit(cache=True, fastmath=True)
+def _assign_cells(ltrb, width, height):
+    """Map each box to its 3x3 grid cell index (row * 3 + col)"""
+    out = np.empty(len(ltrb), np.int64)
+    for i in range(len(ltrb)):
+        cx = (ltrb[i, 0] + ltrb[i, 2]) * 0.5
+        cy = (ltrb[i, 1] + ltrb[i, 3]) * 0.5
+        col = min(int(cx * 3) // width, 2)
+        row = min(int(cy * 3) // height, 2)
+        out[i] = row * 3 + col
+    return out
+
+
+# Row-major 3x3 region names; indexed as row * 3 + col
+_POSITIONS = (
+    "top left", "top middle", "top right",
+    "mid left", "center", "mid right",
+    "bot left", "bot middle", "bot right"
+)
+
+_grid_overlays = {}
+
+
+def _grid_overlay(width, height):
+    """
+    Pre-render the 3x3 grid (lines + region labels) once per
+    resolution. The grid is static, so the ~13 cv2 rasterization
+    calls per frame collapse into a single masked copy.
+    """
+    cached = _grid_overlays.get((width, height))
+    if cached is not None:
+        return cached
+
+    overlay = np.zeros((height, width, 3), np.uint8)
+    step_x = width // 3
+    step_y = height // 3
+
+    for i in range(1, 3):
+        cv2.line(overlay, (i * step_x, 0), (i * step_x, height), (0, 0, 255), 2)
+        cv2.line(overlay, (0, i * step_y), (width, i * step_y), (200, 0, 0), 2)
+
+    for row in range(3):
+        for col in range(3):
+            label = _POSITIONS[row * 3 + col]
+            x = col * step_x + 10
+            y = row * step_y + 30
+            cv2.putText(overlay, label, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 150, 255), 1)
+
+    mask = overlay.any(axis=2, keepdims=True)
+    _grid_overlays[(width, height)] = (overlay, mask)
+    return overlay, mask
+
+
 # Get 3x3 region name
 def get_position_name(x_center, y_center, frame_width, frame_height):
-    col = x_center * 3 // frame_width
-    row = y_center * 3 // frame_height
-
-    positions = [
-        ["top left", "top middle", "top right"],
-        ["mid left", "center", "mid right"],
-        ["bot left", "bot middle", "bot right"]
-    ]
+    # min() clamps centers sitting exactly on the right/bottom edge
+    return _POSITIONS[min(y_center * 3 // frame_height, 2) * 3 +
+                      min(x_center * 3 // frame_width, 2)]
+
+@lru_cache(maxsize=256)
+def _synthesize(text):
+    """
+    Render a sentence to mp3 bytes, once. Scenes repeat, so the same
+    sentences come back constantly; a cache hit skips the blocking
+    HTTPS round-trip to the gTTS endpoint entirely.
+    """
+    buf = BytesIO()
+    gTTS(text=text, lang='en').write_to_fp(buf)
+    return buf.getvalue()
+
+
+def _play(mp3_bytes):
+    """Play mp3 bytes straight from memory - no temp file, no deletes"""
+    import sounddevice
+    import soundfile
+    data, rate = soundfile.read(BytesIO(mp3_bytes))
+    sounddevice.play(data, rate)
+    sounddevice.wait()
 
-    return positions[int(row)][int(col)]
 
 def speak_labels_gtts(labels):
     global is_speaking
@@ -69,99 +243,200 @@ def speak_labels_gtts(labels):
         # Merge all into one text
         text = " ".join(sentences)
 
-        # Text-to-speech
-        tts = gTTS(text=text, lang='en')
-        tts.save("temp_voice.mp3")
-        playsound("temp_voice.mp3")
-        os.remove("temp_voice.mp3")
+        # Text-to-speech: synthesis is memoized, playback is in-memory
+        _play(_synthesize(text))
 
     except Exception as e:
         print("TTS Error:", e)
     is_speaking = False
 
-cv2.namedWindow("YOLOv8 + DeepSORT", cv2.WINDOW_NORMAL)
-cv2.setWindowProperty("YOLOv8 + DeepSORT", cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
-
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        break
-
-    height, width, _ = frame.shape
-    step_x = width // 3
-    step_y = height // 3
-
-    for i in range(1, 3):
-        cv2.line(frame, (i * step_x, 0), (i * step_x, height), (0, 0, 255), 2)
-        cv2.line(frame, (0, i * step_y), (width, i * step_y), (200, 0, 0), 2)
-
-    region_labels = [
-        ["top left", "top middle", "top right"],
-        ["mid left", "center", "mid right"],
-        ["bot left", "bot middle", "bot right"]
-    ]
-    for row in range(3):
-        for col in range(3):
-            label = region_labels[row][col]
-            x = col * step_x + 10
-            y = row * step_y + 30
-            cv2.putText(frame, label, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 150, 255), 1)
-
-    results_model = model(frame)
-    results = results_model[0]
-
-    detections = []
-    label_dict = {}
-
-    for box in results.boxes.data:
-        x1, y1, x2, y2, conf, cls = box
-        x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-        conf = float(conf)
-        label = model.names[int(cls)]
-
-        if conf < threshold_object:
-            continue
-        if label not in important_labels:
-            continue
-
-        detections.append(([x1, y1, x2 - x1, y2 - y1], conf, label))
-        label_dict[label] = (x1, y1, x2, y2)
-
-    # Update tracker
-    tracks = tracker.update_tracks(detections, frame=frame)
-    current_labels = set()
-    current_ids = set()
-
-    for track in tracks:
-        if not track.is_confirmed():
+def main():
+    tier = Tier.MEDIUM
+    model = _get_model(tier)
+    keep_ids, keep_mask, label_table = _class_filter(model)
+    tracker = _get_tracker()
+
+    cap = cv2.VideoCapture(0)
+
+    # Capture at the size the model wants instead of dragging a
+    # 720p/1080p default across the bus only for YOLO to shrink it;
+    # MJPG lets the camera compress in hardware
+    width = _CFG.MAX_IMAGE_WIDTH
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, int(width * 9 / 16))
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+
+    # Capture in its own thread so the camera wait overlaps inference;
+    # maxlen=1 means the loop always sees the freshest frame and stale
+    # ones are silently discarded
+    latest = collections.deque(maxlen=1)
+    stop_capture = threading.Event()
+
+    def _capture():
+        while not stop_capture.is_set():
+            ret, grabbed = cap.read()
+            if not ret:
+                break
+            latest.append(grabbed)
+
+    grab_thread = threading.Thread(target=_capture, daemon=True)
+    grab_thread.start()
+
+    threading.Thread(target=_voice_worker, daemon=True).start()
+
+    last_ids_hash = 0
+    last_spoken_time = time.time()
+
+    budget_ms = _CFG.TIER_LATENCY_MS_BUDGET
+    ewma_ms = 0.0
+
+    stride = _CFG.DETECTION_STRIDE
+    frame_idx = 0
+
+    # Headless deployments skip every display call - no X11 window, no
+    # per-frame blit - and stop on SIGINT/SIGTERM instead of waitKey
+    headless = _CFG.HEADLESS
+
+    # Bind the loop's hot callables to locals: LOAD_FAST in the frame
+    # path instead of a LOAD_GLOBAL + LOAD_ATTR pair per call
+    _now = time.time
+    _perf = time.perf_counter
+    _sleep = time.sleep
+    _polylines = cv2.polylines
+    _put_text = cv2.putText
+    _imshow = cv2.imshow
+    _wait_key = cv2.waitKey
+    _copyto = np.copyto
+    stop_loop = threading.Event()
+    if headless:
+        signal.signal(signal.SIGINT, lambda *_: stop_loop.set())
+        signal.signal(signal.SIGTERM, lambda *_: stop_loop.set())
+    else:
+        cv2.namedWindow("YOLOv8 + DeepSORT", cv2.WINDOW_NORMAL)
+        cv2.setWindowProperty("YOLOv8 + DeepSORT", cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+
+    while True:
+        try:
+            frame = latest.popleft()
+        except IndexError:
+            if not grab_thread.is_alive():
+                break
+            _sleep(0.001)
             continue
-        track_id = track.track_id
-        l, t, w, h = track.to_ltrb()
-        x_center = int((l + w) / 2)
-        y_center = int((t + h) / 2)
-        label = track.get_det_class()
-
-        position = get_position_name(x_center, y_center, width, height)
-        label_pos = f"{label} in {position}"
-
-        current_labels.add(label_pos)
-        current_ids.add(track_id)
-
-        # Draw
-        cv2.rectangle(frame, (int(l), int(t)), (int(w), int(h)), (0, 255, 0), 2)
-        cv2.putText(frame, f"{label} ID:{track_id}", (int(l), int(t) - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
-
-    cv2.imshow("YOLOv8 + DeepSORT", frame)
-
-    if (time.time() - last_spoken_time > 10) and (current_ids != last_spoken_ids) and not is_speaking and not mute:
-        thread = threading.Thread(target=speak_labels_gtts, args=(list(current_labels),))
-        thread.daemon = True
-        thread.start()
-        last_spoken_ids = current_ids
-        last_spoken_time = time.time()
-
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
 
-cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+        height, width, _ = frame.shape
+
+        if not headless:
+            # Stamp the pre-rendered grid instead of redrawing it
+            overlay, mask = _grid_overlay(width, height)
+            _copyto(frame, overlay, where=mask)
+
+        # YOLO dominates wall time, so only pay for it every Nth
+        # frame; in between the tracker's Kalman filter advances the
+        # existing boxes for free
+        frame_idx += 1
+        detections = []
+        if frame_idx % stride == 0:
+            infer_start = _perf()
+            # stream=True hands back a generator instead of building a
+            # Results list; conf/classes push the filtering into NMS
+            results = next(iter(model(
+                frame, stream=True,
+                conf=threshold_object,
+                iou=_CFG.DETECTION_IOU,
+                classes=keep_ids,
+                max_det=_CFG.MAX_DETECTIONS,
+                verbose=False
+            )))
+
+            # Rolling latency estimate; drop to a smaller model when
+            # the current one can't hold the frame budget
+            frame_ms = (_perf() - infer_start) * 1000.0
+            ewma_ms = frame_ms if ewma_ms == 0.0 else 0.9 * ewma_ms + 0.1 * frame_ms
+            if ewma_ms > budget_ms and tier > Tier.NANO:
+                tier -= 1
+                print(f"Latency {ewma_ms:.0f}ms over budget, dropping to {_TIER_WEIGHTS[tier]}")
+                model = _get_model(tier)
+                keep_ids, keep_mask, label_table = _class_filter(model)
+                ewma_ms = 0.0
+
+            # One bulk transfer; conf and class filtering already
+            # happened inside NMS, the mask is a branchless guard in
+            # case a backend ignores classes=
+            data = results.boxes.data.cpu().numpy()
+            for x1, y1, x2, y2, conf, cls in data:
+                cid = int(cls)
+                if not keep_mask[cid]:
+                    continue
+                detections.append(([int(x1), int(y1), int(x2 - x1), int(y2 - y1)],
+                                   float(conf), label_table[cid]))
+
+        # Update tracker (an empty detection list still advances the
+        # Kalman predictor on skipped frames)
+        tracks = tracker.update_tracks(detections, frame=frame)
+
+        # An xor of id hashes stands in for the old per-frame set of
+        # track ids: comparing two ints is enough to tell whether the
+        # scene membership changed
+        ids_hash = 0
+        confirmed = []
+        draw_labels = []
+
+        for track in tracks:
+            if not track.is_confirmed():
+                continue
+            track_id = track.track_id
+            ids_hash ^= hash(track_id)
+            # to_ltrb() really returns left, top, right, bottom
+            l, t, r, b = track.to_ltrb()
+            label = track.get_det_class()
+            confirmed.append((l, t, r, b, label))
+            if not headless:
+                draw_labels.append((int(l), int(t), f"{label} ID:{track_id}"))
+
+        if not headless:
+            if confirmed:
+                # One polylines call draws every box; per-call color and
+                # thickness setup happens once instead of per track
+                pts = np.array([[[l, t], [r, t], [r, b], [l, b]]
+                                for l, t, r, b, _ in confirmed], dtype=np.int32)
+                _polylines(frame, pts, True, (0, 255, 0), 2)
+                font = cv2.FONT_HERSHEY_SIMPLEX
+                for x, y, text in draw_labels:
+                    _put_text(frame, text, (x, y - 10), font, 0.5, (0, 255, 255), 2)
+            _imshow("YOLOv8 + DeepSORT", frame)
+
+        # Cheap checks first; the label strings are only built when an
+        # announcement actually fires
+        if not is_speaking and not mute and (_now() - last_spoken_time > 10) and ids_hash != last_ids_hash:
+            current_labels = set()
+            if confirmed:
+                # All centers and grid cells in one JIT-compiled pass
+                ltrb = np.array([box[:4] for box in confirmed])
+                cells = _assign_cells(ltrb, width, height)
+                current_labels = {
+                    f"{box[4]} in {_POSITIONS[cell]}"
+                    for box, cell in zip(confirmed, cells)
+                }
+            try:
+                _voice_q.put_nowait(list(current_labels))
+            except queue.Full:
+                print("Voice queue full, dropping announcement")
+            last_ids_hash = ids_hash
+            last_spoken_time = _now()
+
+        if headless:
+            if stop_loop.is_set():
+                break
+        elif _wait_key(1) & 0xFF == ord('q'):
+            break
+
+    stop_capture.set()
+    grab_thread.join(timeout=1.0)
+    cap.release()
+    if not headless:
+        cv2.destroyAllWindows()
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
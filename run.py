@@ -1,14 +1,24 @@
 # run.py
 import os
 import sys
-from app import create_app
+from functools import lru_cache
+
+# Keep BLAS/OpenMP pools to one thread each; set before numpy/torch are
+# imported (via the app) so the libraries pick the values up
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+os.environ.setdefault('MKL_NUM_THREADS', '1')
 
 # Add current directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
-# Create Flask app
-app = create_app()
+
+@lru_cache(maxsize=1)
+def _scan_models(models_dir):
+    """List model weight files once; debug reloads reuse the result"""
+    return [f for f in os.listdir(models_dir)
+            if f.endswith(('.pt', '.onnx', '.engine'))]
+
 
 if __name__ == '__main__':
     print("🚀 Starting AI Vision System...")
@@ -16,16 +26,20 @@ if __name__ == '__main__':
     print(f"   - Python Path: {sys.executable}")
     print(f"   - Working Directory: {os.getcwd()}")
     print(f"   - Project Root: {current_dir}")
-    
+
     # Check if models directory exists
     models_dir = os.path.join(current_dir, "models")
     if os.path.exists(models_dir):
         print(f"   - Models Directory: ✅ Found")
-        model_files = [f for f in os.listdir(models_dir) if f.endswith(('.pt', '.onnx', '.engine'))]
-        print(f"   - Model Files: {model_files}")
+        print(f"   - Model Files: {_scan_models(models_dir)}")
     else:
         print(f"   - Models Directory: ❌ Not Found")
-    
+
+    # Importing the app pulls in Ultralytics/Torch (seconds); do it only
+    # when we are actually going to serve
+    from app import create_app
+    app = create_app()
+
     # Start the Flask development server
     try:
         app.run(
@@ -36,4 +50,4 @@ if __name__ == '__main__':
         )
     except Exception as e:
         print(f"❌ Failed to start server: {str(e)}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)